@@ -1,23 +1,57 @@
 """热搜插件主模块"""
+import asyncio
 import time
-from typing import Dict, List, Tuple
+from collections import defaultdict
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 from nonebot import on_command
 from nonebot.exception import FinishedException
 from nonebot.params import CommandArg
 from nonebot.adapters import Message, Event
+from nonebot.permission import SUPERUSER
 from nonebot.plugin import PluginMetadata
-from nonebot import get_plugin_config
+from nonebot import get_driver, get_plugin_config
 from nonebot.log import logger
 
 from .config import Config
-from .get_bilibili_hot_search import get_bilibili_hot_search
-from .get_weibo_hot_search import get_weibo_hot_search
-from .get_douyin_hot_search import get_douyin_hot_search_list as get_douyin_hot_search
+from . import an_aggregate, an_executor, an_render, an_utils
+from .get_bilibili_hot_search import get_bilibili_data, parse_bilibili_data
+from .get_weibo_hot_search import get_weibo_data, parse_weibo_data
+from .get_douyin_hot_search import get_douyin_hot_search, build_douyin_hot_list
+
+try:
+    from nonebot.adapters.onebot.v11 import MessageSegment
+except ImportError:  # 未安装 OneBot V11 适配器时仅支持文本模式
+    MessageSegment = None
 
 # 获取配置
 config = get_plugin_config(Config)
 
+# 请求模式（正常 / 记录 / 回放）
+an_utils.set_fetch_mode(config.fetch_mode, config.fetch_archive_path)
+
+# 解析与渲染执行器
+offload_executor = an_executor.OffloadExecutor(
+    config.executor_type,
+    config.executor_workers,
+    config.executor_max_pending,
+    config.offload_threshold,
+)
+driver = get_driver()
+driver.on_shutdown(offload_executor.shutdown)
+
+
+@driver.on_startup
+async def start_offload_executor():
+    """启动执行器，并在未配置阈值时测量内联解析阈值"""
+    # 进程池需要在其他线程创建之前 fork
+    offload_executor.start()
+
+    if offload_executor.executor_type != "inline" and offload_executor.inline_threshold < 0:
+        threshold = await offload_executor.calibrate(partial(an_utils.decode_and_parse, parse_weibo_data))
+        logger.info(f"热搜解析执行器: {offload_executor.executor_type}，内联阈值 {threshold} 字节（启动时测量）")
+
 # 插件元数据
 __plugin_meta__ = PluginMetadata(
     name="热搜查询",
@@ -26,7 +60,9 @@ __plugin_meta__ = PluginMetadata(
     B站热搜 [数量] - 查询B站热搜
     微博热搜 [数量] - 查询微博热搜
     抖音热搜 [数量] - 查询抖音热搜
-    热搜状态 - 查看插件状态""",
+    综合热搜 [数量] - 查询合并去重后的全平台热搜
+    热搜状态 - 查看插件状态
+    热搜错误 - 查看请求错误统计（超级用户）""",
     config=Config,
 )
 
@@ -34,7 +70,9 @@ __plugin_meta__ = PluginMetadata(
 bilibili_hot = on_command("B站热搜", aliases={"b站热搜", "bilibili热搜"}, priority=10, block=True)
 weibo_hot = on_command("微博热搜", aliases={"微博热搜榜","weibo热搜"}, priority=10, block=True)
 douyin_hot = on_command("抖音热搜", aliases={"抖音热搜榜","douyin热搜"}, priority=10, block=True)
+aggregate_hot = on_command("综合热搜", aliases={"全网热搜"}, priority=10, block=True)
 status_cmd = on_command("热搜状态", priority=10, block=True)
+error_cmd = on_command("热搜错误", permission=SUPERUSER, priority=10, block=True)
 
 # 冷却时间存储 - 使用群号和QQ号
 cooldown_data: Dict[str, Dict[str, float]] = {
@@ -112,19 +150,106 @@ class CooldownManager:
                 del cooldown_data[session_type][key]
 
 
+# 热搜快照存储 {平台: {"version": 版本号, "key": 内容键, "hot_list": 热搜列表, "updated_at": 更新时间}}
+snapshot_data: Dict[str, Dict[str, Any]] = {}
+
+# 各平台的刷新锁
+refresh_locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+
+class SnapshotManager:
+    """热搜快照管理器"""
+
+    @staticmethod
+    def update(platform: str, hot_list: List[Dict]) -> int:
+        """更新平台快照，内容变化时版本号加一，返回当前版本号"""
+        key = tuple(
+            (item.get('rank'), item.get('word'), item.get('hot_value'), item.get('label'))
+            for item in hot_list
+        )
+
+        snapshot = snapshot_data.get(platform)
+        if snapshot and snapshot["key"] == key:
+            return snapshot["version"]
+
+        version = snapshot["version"] + 1 if snapshot else 1
+        snapshot_data[platform] = {
+            "version": version,
+            "key": key,
+            "hot_list": hot_list,
+            "updated_at": time.time(),
+        }
+        return version
+
+    @staticmethod
+    async def refresh(
+            platform: str,
+            fetcher: Callable[..., Any],
+            parser: Callable[[Any], List[Dict]],
+            transform: Optional[Callable[[List[Dict]], List[Dict]]] = None
+    ) -> Tuple[List[Dict], int]:
+        """拉取热搜并更新快照，上游内容未变化时跳过解析直接复用上次快照"""
+        # 同一平台串行刷新，避免并发时返回另一次刷新之前的旧快照
+        async with refresh_locks[platform]:
+            snapshot = snapshot_data.get(platform)
+
+            # 网络请求放到线程池，JSON解码与解析一起按原始响应体大小决定是否放到执行器
+            loop = asyncio.get_running_loop()
+            data = await loop.run_in_executor(None, partial(fetcher, conditional=snapshot is not None, decode=False))
+
+            if data is an_utils.NOT_MODIFIED:
+                return snapshot["hot_list"], snapshot["version"]
+
+            if not data:
+                return [], 0
+
+            response = an_utils.last_responses.get(platform, {})
+            endpoint = response.get("endpoint", "")
+            try:
+                hot_list = await offload_executor.run(
+                    an_utils.decode_and_parse, parser, data, size=response.get("size", 0)
+                )
+            except an_utils.FetchError as e:
+                # 解析失败的响应不参与下次的未变化判断
+                an_utils.discard_conditional_state(platform)
+                an_utils.record_parse_failure(platform, endpoint, data, e.category, str(e))
+                raise
+            except Exception:
+                # 执行器故障（如序列化失败）不是上游的问题，不计入解析失败
+                an_utils.discard_conditional_state(platform)
+                raise
+
+            if not hot_list:
+                an_utils.discard_conditional_state(platform)
+                an_utils.record_parse_failure(platform, endpoint, data, an_utils.ERROR_SCHEMA, "解析结果为空")
+
+            if hot_list and transform:
+                hot_list = transform(hot_list)
+
+            if not hot_list:
+                return [], 0
+
+            return hot_list, SnapshotManager.update(platform, hot_list)
+
+
+# 图片卡片缓存
+render_cache = an_render.RenderCache(config.image_cache_size, offload_executor.run)
+
+
 class HotSearchFormatter:
     """热搜格式化器"""
 
+    platform_names = {
+        "bilibili": " B站热搜",
+        "weibo": " 微博热搜",
+        "douyin": " 抖音热搜",
+        "aggregate": " 综合热搜"
+    }
+
     @staticmethod
     def format_hot_search(platform: str, hot_list: List[Dict], count: int = 10) -> str:
         """格式化热搜列表为消息字符串"""
-        platform_names = {
-            "bilibili": " B站热搜",
-            "weibo": " 微博热搜",
-            "douyin": " 抖音热搜"
-        }
-
-        platform_name = platform_names.get(platform, platform)
+        platform_name = HotSearchFormatter.platform_names.get(platform, platform)
 
         # 过滤空列表
         if not hot_list:
@@ -162,6 +287,36 @@ class HotSearchFormatter:
 
         return "\n".join(lines)
 
+    @staticmethod
+    async def format_hot_search_image(platform: str, hot_list: List[Dict], count: int, version: int) -> bytes:
+        """渲染热搜列表为图片卡片，同一快照版本的渲染结果会被缓存复用"""
+        platform_name = HotSearchFormatter.platform_names.get(platform, platform).strip()
+
+        key = (platform, version, count, config.image_theme)
+        return await render_cache.get_or_render(
+            key,
+            an_render.render_hot_search_card,
+            platform_name,
+            hot_list,
+            count,
+            config.image_theme,
+            config.image_font_path,
+            config.show_label,
+            config.show_hot_value,
+        )
+
+    @staticmethod
+    async def build_reply(platform: str, hot_list: List[Dict], count: int, version: int) -> Union[str, Any]:
+        """根据回复模式生成消息，图片渲染不可用或失败时回退为文本"""
+        if config.render_mode == "image" and MessageSegment and an_render.is_available():
+            try:
+                image = await HotSearchFormatter.format_hot_search_image(platform, hot_list, count, version)
+                return MessageSegment.image(image)
+            except Exception as e:
+                logger.warning(f"渲染热搜图片失败，回退为文本: {e}")
+
+        return HotSearchFormatter.format_hot_search(platform, hot_list, count)
+
 
 async def get_count_from_args(args: Message) -> int:
     """从命令参数中提取数量"""
@@ -175,6 +330,11 @@ async def get_count_from_args(args: Message) -> int:
     return config.default_count
 
 
+def filter_top_weibo(hot_list: List[Dict]) -> List[Dict]:
+    """过滤掉微博置顶热搜（第0条）"""
+    return [item for item in hot_list if item.get('rank', 0) > 0]
+
+
 @bilibili_hot.handle()
 async def handle_bilibili_hot(event: Event, args: Message = CommandArg()):
     """处理B站热搜命令"""
@@ -191,13 +351,13 @@ async def handle_bilibili_hot(event: Event, args: Message = CommandArg()):
 
     try:
         # 获取热搜数据
-        hot_list = get_bilibili_hot_search()
+        hot_list, version = await SnapshotManager.refresh("bilibili", get_bilibili_data, parse_bilibili_data)
 
         if not hot_list:
             await bilibili_hot.finish("获取B站热搜失败，请稍后重试")
 
         # 格式化消息
-        message = HotSearchFormatter.format_hot_search("bilibili", hot_list, count)
+        message = await HotSearchFormatter.build_reply("bilibili", hot_list, count, version)
 
         # 更新冷却时间
         CooldownManager.update_cooldown(event)
@@ -226,17 +386,15 @@ async def handle_weibo_hot(event: Event, args: Message = CommandArg()):
 
     try:
         # 获取热搜数据
-        hot_list = get_weibo_hot_search()
+        # 如果不包含置顶热搜，过滤掉第0条
+        transform = None if config.include_top_weibo else filter_top_weibo
+        hot_list, version = await SnapshotManager.refresh("weibo", get_weibo_data, parse_weibo_data, transform)
 
         if not hot_list:
             await weibo_hot.finish("获取微博热搜失败，请稍后重试")
 
-        # 如果不包含置顶热搜，过滤掉第0条
-        if not config.include_top_weibo:
-            hot_list = [item for item in hot_list if item.get('rank', 0) > 0]
-
         # 格式化消息
-        message = HotSearchFormatter.format_hot_search("weibo", hot_list, count)
+        message = await HotSearchFormatter.build_reply("weibo", hot_list, count, version)
 
         # 更新冷却时间
         CooldownManager.update_cooldown(event)
@@ -265,13 +423,13 @@ async def handle_douyin_hot(event: Event, args: Message = CommandArg()):
 
     try:
         # 获取热搜数据
-        hot_list = get_douyin_hot_search()
+        hot_list, version = await SnapshotManager.refresh("douyin", get_douyin_hot_search, build_douyin_hot_list)
 
         if not hot_list:
             await douyin_hot.finish("获取抖音热搜失败，请稍后重试")
 
         # 格式化消息
-        message = HotSearchFormatter.format_hot_search("douyin", hot_list, count)
+        message = await HotSearchFormatter.build_reply("douyin", hot_list, count, version)
 
         # 更新冷却时间
         CooldownManager.update_cooldown(event)
@@ -284,6 +442,65 @@ async def handle_douyin_hot(event: Event, args: Message = CommandArg()):
         await douyin_hot.finish("获取抖音热搜时出现错误")
 
 
+@aggregate_hot.handle()
+async def handle_aggregate_hot(event: Event, args: Message = CommandArg()):
+    """处理综合热搜命令"""
+    if not config.enable_aggregate:
+        await aggregate_hot.finish("综合热搜功能已禁用")
+
+    # 检查冷却
+    can_send, remaining = CooldownManager.check_cooldown(event)
+    if not can_send:
+        await aggregate_hot.finish(f"冷却中，请等待 {remaining} 秒")
+
+    # 获取数量
+    count = await get_count_from_args(args)
+
+    try:
+        # 并发刷新各平台快照，单个平台失败不影响其他平台
+        platforms = [
+            ("bilibili", config.enable_bilibili, get_bilibili_data, parse_bilibili_data, None),
+            ("weibo", config.enable_weibo, get_weibo_data, parse_weibo_data,
+             None if config.include_top_weibo else filter_top_weibo),
+            ("douyin", config.enable_douyin, get_douyin_hot_search, build_douyin_hot_list, None),
+        ]
+        platforms = [platform for platform in platforms if platform[1]]
+        results = await asyncio.gather(
+            *(SnapshotManager.refresh(platform, fetcher, parser, transform)
+              for platform, _, fetcher, parser, transform in platforms),
+            return_exceptions=True
+        )
+
+        snapshots = {}
+        for (platform, *_), result in zip(platforms, results):
+            if isinstance(result, Exception):
+                logger.warning(f"综合热搜获取{platform}失败: {result}")
+                continue
+            hot_list, version = result
+            if hot_list:
+                snapshots[platform] = (version, hot_list)
+
+        if not snapshots:
+            await aggregate_hot.finish("获取综合热搜失败，请稍后重试")
+
+        # 各平台快照版本不变时直接复用上次合并结果
+        hot_list = await an_aggregate.get_aggregate(snapshots, config.aggregate_similarity, offload_executor.run)
+        version = SnapshotManager.update("aggregate", hot_list)
+
+        # 格式化消息
+        message = await HotSearchFormatter.build_reply("aggregate", hot_list, count, version)
+
+        # 更新冷却时间
+        CooldownManager.update_cooldown(event)
+
+        await aggregate_hot.finish(message)
+    except  FinishedException:
+        raise
+    except Exception as e:
+        logger.error(f"获取综合热搜失败: {e}")
+        await aggregate_hot.finish("获取综合热搜时出现错误")
+
+
 @status_cmd.handle()
 async def handle_status():
     """处理状态查询命令"""
@@ -293,16 +510,53 @@ async def handle_status():
         f"• B站热搜: {' 启用' if config.enable_bilibili else ' 禁用'}",
         f"• 微博热搜: {' 启用' if config.enable_weibo else ' 禁用'}",
         f"• 抖音热搜: {' 启用' if config.enable_douyin else ' 禁用'}",
+        f"• 综合热搜: {' 启用' if config.enable_aggregate else ' 禁用'}",
         f"• 冷却时间: {config.cooldown_time}秒",
         f"• 默认条数: {config.default_count}条",
         f"• 显示热度: {'是' if config.show_hot_value else '否'}",
         f"• 显示标签: {'是' if config.show_label else '否'}",
         f"• 微博置顶: {'包含' if config.include_top_weibo else '不包含'}",
+        f"• 请求模式: {an_utils.fetch_mode['mode']}",
+        f"• 回复模式: {'图片' if config.render_mode == 'image' else '文本'}",
+        f"• 图片缓存: {len(render_cache)}张",
+        f"• 执行器: {offload_executor.executor_type}"
+        f"（卸载 {offload_executor.stats['offloaded']} / 内联 {offload_executor.stats['inline']}）",
+        "• 未变化跳过: " + " / ".join(
+            f"{name}{an_utils.get_skip_rate(platform):.0%}"
+            for platform, name in (("bilibili", "B站"), ("weibo", "微博"), ("douyin", "抖音"))
+        ),
     ]
 
+    error_counts = an_utils.error_counter.snapshot()
+    status_lines.append(f"• 请求错误: {sum(error_counts.values())}次")
+
     await status_cmd.finish("\n".join(status_lines))
 
 
+@error_cmd.handle()
+async def handle_errors():
+    """处理错误统计查询命令"""
+    error_counts = an_utils.error_counter.snapshot()
+
+    if not error_counts:
+        await error_cmd.finish("暂无请求错误")
+
+    lines = [" 热搜请求错误统计", "=" * 20]
+    for (platform, endpoint, category), count in sorted(error_counts.items(), key=lambda item: -item[1]):
+        lines.append(f"• {platform} {endpoint} [{category}] ×{count}")
+
+    # 每个接口只展示最近一条采样
+    # 请求线程可能同时新增采样，遍历副本
+    for (platform, endpoint), samples in list(an_utils.payload_samples.items()):
+        if samples:
+            sample = samples[-1]
+            lines.append("-" * 20)
+            lines.append(f"{platform} {endpoint} 采样 ({sample['category']}): {sample['reason']}")
+            lines.append(sample["payload"][:200])
+
+    await error_cmd.finish("\n".join(lines))
+
+
 # 定时清理过期的冷却记录
 import nonebot
 from nonebot import require
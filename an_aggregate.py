@@ -0,0 +1,226 @@
+"""
+综合热搜模块
+合并各平台热搜快照，对近似重复的热搜词去重并按综合得分排序
+"""
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Optional, Dict, Any, List, Set, Tuple, Callable, Awaitable
+
+
+PLATFORM_LABELS = {
+    'weibo': '微博',
+    'douyin': '抖音',
+    'bilibili': 'B站',
+}
+
+# 得分权重：排名得分在 0-1 之间，热度得分按平台内最大热度归一化到 0-1
+RANK_WEIGHT = 1.0
+HEAT_WEIGHT = 0.5
+
+# 字符 n-gram 长度
+NGRAM_SIZE = 2
+
+# 已合并结果缓存 {"key": 各平台快照版本, "result": 合并结果}
+_aggregate_cache: Dict[str, Any] = {"key": None, "result": []}
+
+
+def normalize_word(word: str) -> str:
+    """
+    归一化热搜词：全半角统一、小写、去掉空白和标点（如微博话题的 #）
+
+    Args:
+        word: 热搜词
+
+    Returns:
+        归一化后的文本
+    """
+    text = unicodedata.normalize("NFKC", str(word)).lower()
+    return "".join(ch for ch in text if ch.isalnum())
+
+
+def display_word(word: str) -> str:
+    """
+    返回用于展示的热搜词，去掉微博话题的 #…# 包裹
+
+    Args:
+        word: 热搜词
+
+    Returns:
+        展示文本
+    """
+    text = str(word).strip()
+    match = re.fullmatch(r"#(.+)#", text)
+    return match.group(1).strip() if match else text
+
+
+def get_ngrams(text: str, size: int = NGRAM_SIZE) -> Set[str]:
+    """
+    返回文本的字符 n-gram 集合
+
+    Args:
+        text: 归一化后的文本
+        size: n-gram 长度
+
+    Returns:
+        n-gram 集合，文本短于 size 时为文本本身
+    """
+    if len(text) < size:
+        return {text} if text else set()
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+def parse_hot_value(hot_value: Any) -> float:
+    """
+    将热度值转换为数字，兼容 "1,234,567" 这类格式化字符串
+
+    Args:
+        hot_value: 原始热度值
+
+    Returns:
+        热度数值，无法解析时为0
+    """
+    if isinstance(hot_value, (int, float)):
+        return float(hot_value)
+
+    match = re.search(r"\d+(?:\.\d+)?", str(hot_value or "").replace(",", ""))
+    return float(match.group()) if match else 0.0
+
+
+def score_platform_items(hot_list: List[Dict[str, Any]]) -> List[float]:
+    """
+    计算单个平台内各条热搜的得分
+
+    Args:
+        hot_list: 平台热搜列表
+
+    Returns:
+        与 hot_list 一一对应的得分列表
+    """
+    size = len(hot_list)
+    heat_values = [parse_hot_value(item.get('hot_value')) for item in hot_list]
+    max_heat = max(heat_values, default=0.0) or 1.0
+
+    scores = []
+    for item, heat in zip(hot_list, heat_values):
+        rank = item.get('rank', 0)
+        # 置顶（rank 0）与第1名同分
+        rank_score = (size - max(rank, 1) + 1) / size
+        scores.append(RANK_WEIGHT * rank_score + HEAT_WEIGHT * heat / max_heat)
+
+    return scores
+
+
+def merge_hot_lists(
+        platform_lists: Dict[str, List[Dict[str, Any]]],
+        threshold: float = 0.6
+) -> List[Dict[str, Any]]:
+    """
+    合并各平台热搜，近似重复的词归为一组并计算综合得分
+
+    归一化文本相同的词直接合并；否则通过 n-gram 倒排索引找出共享 n-gram 的候选词，
+    按 Dice 系数判断相似度，不做两两比较。
+
+    Args:
+        platform_lists: {平台: 热搜列表}
+        threshold: 相似度阈值（0-1）
+
+    Returns:
+        合并后的热搜列表，每个元素包含 'rank', 'word', 'hot_value', 'label', 'platforms', 'score'
+    """
+    groups: List[Dict[str, Any]] = []
+    exact_index: Dict[str, int] = {}
+    ngram_index: Dict[str, List[int]] = defaultdict(list)
+    # 已索引词条 [(所属分组, n-gram 个数)]
+    entries: List[Tuple[int, int]] = []
+
+    for platform, hot_list in platform_lists.items():
+        for item, score in zip(hot_list, score_platform_items(hot_list)):
+            word = item.get('word', '')
+            text = normalize_word(word)
+            if not text:
+                continue
+
+            group_id = exact_index.get(text)
+            grams = get_ngrams(text)
+
+            if group_id is None:
+                # 统计与已有词条共享的 n-gram 个数
+                shared: Dict[int, int] = defaultdict(int)
+                for gram in grams:
+                    for entry_id in ngram_index.get(gram, ()):
+                        shared[entry_id] += 1
+
+                best_similarity = 0.0
+                for entry_id, count in shared.items():
+                    similarity = 2 * count / (len(grams) + entries[entry_id][1])
+                    if similarity >= threshold and similarity > best_similarity:
+                        best_similarity = similarity
+                        group_id = entries[entry_id][0]
+
+            if group_id is None:
+                group_id = len(groups)
+                groups.append({'members': [], 'platforms': {}, 'score': 0.0})
+
+            group = groups[group_id]
+            group['members'].append((score, word, item))
+            # 同一平台有多条近似词时只计最高分
+            if score > group['platforms'].get(platform, 0.0):
+                group['platforms'][platform] = score
+
+            exact_index.setdefault(text, group_id)
+            entry_id = len(entries)
+            entries.append((group_id, len(grams)))
+            for gram in grams:
+                ngram_index[gram].append(entry_id)
+
+    for group in groups:
+        group['score'] = sum(group['platforms'].values())
+
+    groups.sort(key=lambda group: group['score'], reverse=True)
+
+    result_list = []
+    for i, group in enumerate(groups, 1):
+        # 以单平台得分最高的词作为代表
+        _, word, item = max(group['members'], key=lambda member: member[0])
+        platforms = list(group['platforms'])
+        result_list.append({
+            'rank': i,
+            'word': display_word(word),
+            'hot_value': item.get('hot_value', ''),
+            'label': "/".join(PLATFORM_LABELS.get(platform, platform) for platform in platforms),
+            'platforms': platforms,
+            'score': round(group['score'], 4),
+        })
+
+    return result_list
+
+
+async def get_aggregate(
+        snapshots: Dict[str, Tuple[int, List[Dict[str, Any]]]],
+        threshold: float = 0.6,
+        runner: Optional[Callable[..., Awaitable[List[Dict[str, Any]]]]] = None
+) -> List[Dict[str, Any]]:
+    """
+    返回综合热搜，各平台快照版本不变时直接使用缓存
+
+    Args:
+        snapshots: {平台: (快照版本, 热搜列表)}
+        threshold: 相似度阈值
+        runner: 可选的执行函数，用于把合并放到线程池或进程池
+
+    Returns:
+        合并后的热搜列表
+    """
+    key = (tuple(sorted((platform, version) for platform, (version, _) in snapshots.items())), threshold)
+
+    if _aggregate_cache["key"] != key:
+        platform_lists = {platform: hot_list for platform, (_, hot_list) in snapshots.items()}
+        if runner:
+            result = await runner(merge_hot_lists, platform_lists, threshold)
+        else:
+            result = merge_hot_lists(platform_lists, threshold)
+        _aggregate_cache["result"] = result
+        _aggregate_cache["key"] = key
+
+    return _aggregate_cache["result"]
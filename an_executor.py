@@ -0,0 +1,189 @@
+"""
+解析与渲染执行器模块
+将CPU密集的解析、渲染任务放到线程池或进程池执行，避免阻塞事件循环
+"""
+import asyncio
+import json
+import logging
+import multiprocessing
+import statistics
+import time
+from concurrent.futures import BrokenExecutor, Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional, Any, Callable, Sequence
+
+logger = logging.getLogger(__name__)
+
+# 执行器类型：inline 在事件循环中直接执行 / thread 线程池 / process 进程池
+EXECUTOR_TYPES = ("inline", "thread", "process")
+
+# 自动测量阈值时使用的样本条数，以及每个样本的重复次数
+CALIBRATION_SIZES = (10, 50, 200, 1000, 5000, 20000)
+CALIBRATION_ROUNDS = 5
+
+
+def build_sample_payload(count: int) -> bytes:
+    """
+    构造与热搜接口结构相近的JSON响应体，用于测量阈值
+
+    Args:
+        count: 热搜条数
+
+    Returns:
+        JSON响应体
+    """
+    items = [
+        {"word": f"热搜样本词条{i}", "num": 1000000 - i, "label_name": "热", "note": f"样本{i}" * 4}
+        for i in range(count)
+    ]
+    return json.dumps({"code": 0, "data": {"realtime": items}}, ensure_ascii=False).encode("utf-8")
+
+
+def _payload_size(payload: bytes) -> int:
+    """空任务，只用于测量提交到执行器的往返开销（含进程池的序列化）"""
+    return len(payload)
+
+
+def _median_time(func: Callable[[], Any], rounds: int = CALIBRATION_ROUNDS) -> float:
+    """多次执行取耗时中位数"""
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+class OffloadExecutor:
+    """
+    解析与渲染执行器
+
+    排队中的任务数不超过 max_pending，超出时新任务在事件循环中等待空位。
+    给定 size 的任务在小于 inline_threshold 时直接在当前线程执行；
+    inline_threshold 小于0时由 calibrate 在启动时测量得到。
+    进程池损坏（如子进程被 OOM 终止）后改用线程池，不再重新 fork。
+    """
+
+    def __init__(
+            self,
+            executor_type: str = "thread",
+            max_workers: int = 2,
+            max_pending: int = 8,
+            inline_threshold: int = -1
+    ):
+        if executor_type not in EXECUTOR_TYPES:
+            raise ValueError(f"未知的执行器类型: {executor_type}")
+
+        self.executor_type = executor_type
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.inline_threshold = inline_threshold
+        self._executor: Optional[Executor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.stats = {"inline": 0, "offloaded": 0}
+
+    def start(self) -> None:
+        """
+        创建线程池或进程池
+
+        进程池使用 fork 启动，子进程无需重新导入插件包；必须在启动阶段、
+        其他线程（如事件循环的默认线程池）创建之前调用，避免子进程继承被占用的锁。
+        """
+        if self._executor is not None or self.executor_type == "inline":
+            return
+
+        if self.executor_type == "process":
+            if "fork" in multiprocessing.get_all_start_methods():
+                self._executor = ProcessPoolExecutor(
+                    self.max_workers, mp_context=multiprocessing.get_context("fork")
+                )
+                # fork 模式下首次提交任务时会一次性创建全部子进程
+                self._executor.submit(_payload_size, b"").result()
+                return
+            logger.warning("当前平台不支持 fork，执行器类型 process 改为 thread")
+
+        self._use_thread_pool()
+
+    def _use_thread_pool(self) -> None:
+        """创建线程池并替换当前执行器"""
+        self.executor_type = "thread"
+        self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="hot_search")
+
+    async def calibrate(
+            self,
+            work: Callable[[bytes], Any],
+            sizes: Sequence[int] = CALIBRATION_SIZES
+    ) -> int:
+        """
+        测量内联阈值：对不同大小的样本响应，比较在当前线程执行 work 的耗时
+        与提交到执行器的往返耗时，取内联耗时首次超过往返耗时的响应体大小
+
+        Args:
+            work: 对响应体执行的解析函数
+            sizes: 样本条数
+
+        Returns:
+            阈值（字节）
+        """
+        if self._executor is None:
+            return self.inline_threshold
+
+        loop = asyncio.get_running_loop()
+        threshold = None
+
+        for count in sizes:
+            payload = build_sample_payload(count)
+            inline_time = _median_time(lambda: work(payload))
+
+            round_trips = []
+            for _ in range(CALIBRATION_ROUNDS):
+                start = time.perf_counter()
+                await loop.run_in_executor(self._executor, _payload_size, payload)
+                round_trips.append(time.perf_counter() - start)
+
+            if inline_time > statistics.median(round_trips):
+                threshold = len(payload)
+                break
+
+        # 样本范围内内联始终更快时，只卸载比最大样本还大的响应
+        self.inline_threshold = threshold if threshold is not None else len(payload) + 1
+        return self.inline_threshold
+
+    async def run(self, func: Callable[..., Any], *args, size: Optional[int] = None) -> Any:
+        """
+        执行任务
+
+        Args:
+            func: 模块级函数（进程池需要可被 pickle）
+            *args: 函数参数
+            size: 输入数据大小（字节），为None时总是放到执行器中
+
+        Returns:
+            函数返回值
+        """
+        executor = self._executor
+
+        if executor is None or (size is not None and size < self.inline_threshold):
+            self.stats["inline"] += 1
+            return func(*args)
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_pending)
+
+        async with self._semaphore:
+            self.stats["offloaded"] += 1
+            loop = asyncio.get_running_loop()
+            try:
+                return await loop.run_in_executor(executor, func, *args)
+            except BrokenExecutor as e:
+                # 此时事件循环已创建线程，重新 fork 不安全，改用线程池并重试一次
+                if self._executor is executor:
+                    logger.warning(f"{self.executor_type} 执行器已损坏，改用线程池: {e}")
+                    executor.shutdown(wait=False)
+                    self._use_thread_pool()
+                return await loop.run_in_executor(self._executor, func, *args)
+
+    def shutdown(self) -> None:
+        """关闭执行器"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
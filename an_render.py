@@ -0,0 +1,280 @@
+"""
+热搜图片卡片渲染模块
+使用 Pillow 在本地绘制热搜卡片，不依赖浏览器或网络
+"""
+import asyncio
+import io
+from collections import OrderedDict
+from functools import lru_cache
+from datetime import datetime
+from typing import Optional, Dict, Any, List, Tuple, Callable, Awaitable
+
+try:
+    from PIL import Image, ImageDraw, ImageFont
+except ImportError:  # 未安装 Pillow 时仅支持文本模式
+    Image = ImageDraw = ImageFont = None
+
+
+# 卡片主题配色
+THEMES: Dict[str, Dict[str, Tuple[int, int, int]]] = {
+    "light": {
+        "background": (255, 255, 255),
+        "header": (255, 102, 0),
+        "header_text": (255, 255, 255),
+        "text": (34, 34, 34),
+        "sub_text": (136, 136, 136),
+        "divider": (238, 238, 238),
+        "rank_top": (255, 69, 58),
+        "rank": (153, 153, 153),
+        "label": (255, 149, 0),
+    },
+    "dark": {
+        "background": (30, 30, 30),
+        "header": (58, 58, 60),
+        "header_text": (255, 214, 10),
+        "text": (235, 235, 235),
+        "sub_text": (142, 142, 147),
+        "divider": (58, 58, 60),
+        "rank_top": (255, 69, 58),
+        "rank": (142, 142, 147),
+        "label": (255, 159, 10),
+    },
+}
+
+# 常见的系统中文字体，按顺序查找
+FONT_CANDIDATES = [
+    "msyh.ttc",
+    "simhei.ttf",
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/truetype/wqy/wqy-microhei.ttc",
+    "/usr/share/fonts/wqy-microhei/wqy-microhei.ttc",
+    "/System/Library/Fonts/PingFang.ttc",
+]
+
+CARD_WIDTH = 640
+HEADER_HEIGHT = 88
+ROW_HEIGHT = 48
+PADDING = 28
+
+
+def is_available() -> bool:
+    """
+    检查图片渲染是否可用
+
+    Returns:
+        是否已安装 Pillow
+    """
+    return Image is not None
+
+
+@lru_cache(maxsize=16)
+def load_font(size: int, font_path: str = ""):
+    """
+    加载字体，优先使用指定路径，其次查找系统中文字体
+
+    结果按 (字号, 字体路径) 缓存，避免每次渲染都重新读取体积很大的中文字体文件
+
+    Args:
+        size: 字号
+        font_path: 字体路径
+
+    Returns:
+        Pillow 字体对象
+    """
+    candidates = [font_path] if font_path else []
+    candidates.extend(FONT_CANDIDATES)
+
+    for path in candidates:
+        try:
+            return ImageFont.truetype(path, size)
+        except OSError:
+            continue
+
+    try:
+        return ImageFont.load_default(size)
+    except TypeError:  # Pillow < 10.1 不支持指定字号
+        return ImageFont.load_default()
+
+
+def truncate_text(draw, text: str, font, max_width: int) -> str:
+    """
+    按像素宽度截断文本
+
+    Args:
+        draw: ImageDraw 对象
+        text: 原始文本
+        font: 字体
+        max_width: 最大宽度
+
+    Returns:
+        截断后的文本
+    """
+    if draw.textlength(text, font=font) <= max_width:
+        return text
+
+    while text and draw.textlength(text + "…", font=font) > max_width:
+        text = text[:-1]
+
+    return text + "…"
+
+
+def render_hot_search_card(
+        title: str,
+        hot_list: List[Dict[str, Any]],
+        count: int = 10,
+        theme: str = "light",
+        font_path: str = "",
+        show_label: bool = True,
+        show_hot_value: bool = True
+) -> bytes:
+    """
+    将热搜列表渲染为 PNG 卡片
+
+    该函数只依赖参数，可在线程或进程中执行
+
+    Args:
+        title: 卡片标题
+        hot_list: 热搜列表，每个元素包含 'rank', 'word', 'hot_value', 'label'
+        count: 显示条数
+        theme: 主题名称
+        font_path: 字体路径
+        show_label: 是否显示标签
+        show_hot_value: 是否显示热度值
+
+    Returns:
+        PNG 图片数据
+    """
+    if not is_available():
+        raise RuntimeError("未安装 Pillow，无法渲染图片")
+
+    colors = THEMES.get(theme, THEMES["light"])
+    display_list = hot_list[:count]
+
+    height = HEADER_HEIGHT + ROW_HEIGHT * max(len(display_list), 1) + PADDING
+    image = Image.new("RGB", (CARD_WIDTH, height), colors["background"])
+    draw = ImageDraw.Draw(image)
+
+    title_font = load_font(30, font_path)
+    text_font = load_font(22, font_path)
+    small_font = load_font(16, font_path)
+
+    # 标题栏
+    draw.rectangle((0, 0, CARD_WIDTH, HEADER_HEIGHT - 16), fill=colors["header"])
+    draw.text((PADDING, 18), f"{title} TOP{len(display_list)}", font=title_font, fill=colors["header_text"])
+    time_text = datetime.now().strftime('%m-%d %H:%M')
+    time_width = draw.textlength(time_text, font=small_font)
+    draw.text((CARD_WIDTH - PADDING - time_width, 30), time_text, font=small_font, fill=colors["header_text"])
+
+    if not display_list:
+        draw.text((PADDING, HEADER_HEIGHT), "暂无数据", font=text_font, fill=colors["sub_text"])
+
+    y = HEADER_HEIGHT
+    for item in display_list:
+        rank = item.get('rank', 0)
+        word = str(item.get('word', '未知'))
+        hot_value = str(item.get('hot_value', '') or '')
+        label = str(item.get('label', '') or '')
+
+        # 排名
+        rank_str = "置顶" if rank == 0 else str(rank)
+        rank_color = colors["rank_top"] if rank <= 3 else colors["rank"]
+        draw.text((PADDING, y + 10), rank_str, font=text_font, fill=rank_color)
+
+        # 右侧热度值
+        right = CARD_WIDTH - PADDING
+        if show_hot_value and hot_value:
+            hot_width = draw.textlength(hot_value, font=small_font)
+            draw.text((right - hot_width, y + 15), hot_value, font=small_font, fill=colors["sub_text"])
+            right -= hot_width + 12
+
+        # 标签
+        if show_label and label:
+            label_width = draw.textlength(label, font=small_font) + 12
+            draw.rounded_rectangle(
+                (right - label_width, y + 12, right, y + 36), radius=6, outline=colors["label"]
+            )
+            draw.text((right - label_width + 6, y + 14), label, font=small_font, fill=colors["label"])
+            right -= label_width + 12
+
+        # 热搜词
+        word_left = PADDING + 56
+        word = truncate_text(draw, word, text_font, int(right - word_left))
+        draw.text((word_left, y + 10), word, font=text_font, fill=colors["text"])
+
+        y += ROW_HEIGHT
+        draw.line((PADDING, y - 1, CARD_WIDTH - PADDING, y - 1), fill=colors["divider"])
+
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG", optimize=True)
+    return buffer.getvalue()
+
+
+class RenderCache:
+    """
+    图片卡片缓存
+
+    缓存键为 (平台, 快照版本, 条数, 主题)，同一快照版本下所有会话共用一次渲染结果。
+    渲染交给 runner 执行（默认为事件循环的线程池），同一键的并发请求会等待同一个渲染任务。
+    """
+
+    def __init__(self, max_size: int = 32, runner: Optional[Callable[..., Awaitable[bytes]]] = None):
+        self.max_size = max_size
+        self.runner = runner
+        self._items: "OrderedDict[Tuple, asyncio.Future]" = OrderedDict()
+
+    async def get_or_render(self, key: Tuple, render_func: Callable[..., bytes], *args) -> bytes:
+        """
+        获取缓存的渲染结果，不存在时交给 runner 渲染
+
+        Args:
+            key: 缓存键，前两项为平台和快照版本
+            render_func: 渲染函数
+            *args: 渲染函数参数
+
+        Returns:
+            PNG 图片数据
+        """
+        future = self._items.get(key)
+
+        if future is None:
+            self.discard_stale(key[0], key[1])
+            if self.runner:
+                future = asyncio.ensure_future(self.runner(render_func, *args))
+            else:
+                loop = asyncio.get_running_loop()
+                future = loop.run_in_executor(None, render_func, *args)
+            self._items[key] = future
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+        else:
+            self._items.move_to_end(key)
+
+        try:
+            return await asyncio.shield(future)
+        except Exception:
+            # 渲染失败不缓存，下次重新渲染
+            if self._items.get(key) is future:
+                del self._items[key]
+            raise
+
+    def discard_stale(self, platform: str, version: int) -> None:
+        """
+        丢弃该平台低于当前版本的缓存
+
+        仍携带旧版本的并发请求不会淘汰较新版本的渲染结果
+
+        Args:
+            platform: 平台名称
+            version: 当前快照版本
+        """
+        stale_keys = [key for key in self._items if key[0] == platform and key[1] < version]
+        for key in stale_keys:
+            del self._items[key]
+
+    def clear(self) -> None:
+        """清空缓存"""
+        self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
@@ -0,0 +1,138 @@
+"""
+热搜归档回放工具
+将 record 模式记录的原始响应逐条交给各平台解析器，用于离线回归和性能测试
+
+直接按文件路径运行，不需要初始化 NoneBot：
+    python an_replay.py [归档文件路径]
+"""
+import json
+import os
+import sys
+import time
+import types
+from typing import Optional, Dict, Any, Callable, List
+
+if __name__ == "__main__" and not __package__:
+    # 以脚本运行时注册一个不执行插件 __init__ 的空包，使下面的相对导入可用
+    __package__ = "nonebot_plugin_announcement"
+    _package = types.ModuleType(__package__)
+    _package.__path__ = [os.path.dirname(os.path.abspath(__file__))]
+    sys.modules[__package__] = _package
+
+from . import an_utils
+from .get_bilibili_hot_search import parse_bilibili_data
+from .get_weibo_hot_search import parse_weibo_data
+from .get_douyin_hot_search import build_douyin_hot_list
+
+
+# 按域名匹配解析器
+PLATFORM_PARSERS: Dict[str, Callable[[Dict[str, Any]], List[Dict[str, Any]]]] = {
+    'weibo.com': parse_weibo_data,
+    'bilibili.com': parse_bilibili_data,
+    'douyin.com': build_douyin_hot_list,
+}
+
+PLATFORM_NAMES = {
+    'weibo.com': 'weibo',
+    'bilibili.com': 'bilibili',
+    'douyin.com': 'douyin',
+}
+
+
+def get_platform(url: str) -> str:
+    """
+    根据URL判断平台
+
+    Args:
+        url: 请求URL
+
+    Returns:
+        平台域名，未识别时为空字符串
+    """
+    for domain in PLATFORM_PARSERS:
+        if domain in url:
+            return domain
+    return ''
+
+
+def replay_archive(archive_path: str, limit: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    回放归档文件并统计各平台解析结果与吞吐量
+
+    Args:
+        archive_path: 归档文件路径
+        limit: 最多回放的记录数
+
+    Returns:
+        各平台统计 {平台: {'payloads', 'bytes', 'items', 'empty', 'failures', 'seconds', 'payloads_per_sec', 'mb_per_sec'}}
+    """
+    stats: Dict[str, Dict[str, Any]] = {}
+
+    for index, record in enumerate(an_utils.iter_archive(archive_path)):
+        if limit is not None and index >= limit:
+            break
+
+        domain = get_platform(record['url'])
+        if not domain or not 200 <= record['status'] < 300:
+            continue
+
+        platform_stats = stats.setdefault(PLATFORM_NAMES[domain], {
+            'payloads': 0, 'bytes': 0, 'items': 0, 'empty': 0, 'failures': 0, 'seconds': 0.0,
+        })
+        body = an_utils.get_record_body(record)
+
+        # 计时覆盖JSON解码和解析，与线上 make_request + 解析器的路径一致
+        start = time.perf_counter()
+        try:
+            hot_list = PLATFORM_PARSERS[domain](json.loads(body))
+        except Exception:
+            hot_list = None
+            platform_stats['failures'] += 1
+        platform_stats['seconds'] += time.perf_counter() - start
+
+        platform_stats['payloads'] += 1
+        platform_stats['bytes'] += len(body)
+        if hot_list is not None:
+            platform_stats['items'] += len(hot_list)
+            if not hot_list:
+                platform_stats['empty'] += 1
+
+    for platform_stats in stats.values():
+        seconds = platform_stats['seconds'] or 1e-9
+        platform_stats['payloads_per_sec'] = platform_stats['payloads'] / seconds
+        platform_stats['mb_per_sec'] = platform_stats['bytes'] / seconds / 1024 / 1024
+
+    return stats
+
+
+def print_replay_stats(stats: Dict[str, Dict[str, Any]]) -> None:
+    """
+    打印回放统计
+
+    Args:
+        stats: replay_archive 返回的统计
+    """
+    print(f"归档回放统计 {an_utils.format_time()}")
+    an_utils.print_separator(60)
+
+    for platform, platform_stats in stats.items():
+        print(
+            f"{platform:<10} 响应 {platform_stats['payloads']:>6} | "
+            f"条目 {platform_stats['items']:>7} | "
+            f"空结果 {platform_stats['empty']:>5} | "
+            f"失败 {platform_stats['failures']:>5}"
+        )
+        print(
+            f"{'':<10} {platform_stats['payloads_per_sec']:,.0f} 响应/秒 | "
+            f"{platform_stats['mb_per_sec']:,.2f} MB/秒"
+        )
+
+    an_utils.print_separator(60, "-")
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else an_utils.fetch_mode["archive_path"]
+    try:
+        print_replay_stats(replay_archive(path))
+    except Exception as e:
+        print(f"错误: {str(e)}")
@@ -3,45 +3,753 @@
 包含网络请求、错误处理等通用功能
 """
 import requests
+import urllib3
+import base64
+import gzip
+import hashlib
+import itertools
 import json
+import logging
+import threading
 import time
+from collections import deque
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator, List, Tuple, Callable
+from urllib.parse import urlparse
+
+try:
+    import ijson
+except ImportError:  # 未安装 ijson 时不使用流式解析
+    ijson = None
+
+try:
+    # urllib3 会根据已安装的 brotli / zstandard 列出可解码的压缩格式
+    from urllib3.util.request import ACCEPT_ENCODING
+except ImportError:
+    ACCEPT_ENCODING = "gzip,deflate"
+
+logger = logging.getLogger(__name__)
+
+# 压缩格式优先级，越靠前压缩率越高
+ENCODING_PREFERENCE = ("zstd", "br", "gzip", "deflate")
+
+
+def get_accept_encoding() -> str:
+    """
+    按优先级返回当前环境可解码的压缩格式
+
+    Returns:
+        Accept-Encoding 请求头的值
+    """
+    available = {encoding.strip() for encoding in ACCEPT_ENCODING.split(",")}
+    return ", ".join(encoding for encoding in ENCODING_PREFERENCE if encoding in available)
+
+
+# 请求模式：live 正常请求 / record 请求并记录原始响应 / replay 从归档回放
+FETCH_MODES = ("live", "record", "replay")
+
+fetch_mode: Dict[str, Any] = {
+    "mode": "live",
+    "archive_path": "hot_search_archive.jsonl.gz",
+}
+
+# 回放数据 {请求键: [记录, ...]} 与回放游标 {请求键: 下一条序号}
+_replay_records: Dict[str, List[Dict[str, Any]]] = {}
+_replay_cursors: Dict[str, int] = {}
+_archive_lock = threading.Lock()
+
+# 内容未变化时 make_request 返回的标记，调用方应复用上一次的快照
+NOT_MODIFIED = object()
+
+# 条件请求状态 {请求键: {"etag": ETag, "last_modified": Last-Modified, "body_hash": 响应体哈希}}
+_conditional_state: Dict[str, Dict[str, Any]] = {}
+
+# 请求统计 {平台: {"requests": 请求次数, "not_modified": 304次数, "unchanged": 响应体未变化次数}}
+fetch_stats: Dict[str, Dict[str, int]] = {}
+
+# 最近一次响应信息 {平台: {"size": 响应体字节数, "endpoint": 接口路径, "key": 请求键}}
+# size 用于决定解析是否放到执行器中，endpoint 和 key 用于记录解析失败
+last_responses: Dict[str, Dict[str, Any]] = {}
+
+# 请求错误分类
+ERROR_TIMEOUT = "timeout"                # 请求超时
+ERROR_CONNECTION = "connection"          # 连接失败
+ERROR_FORBIDDEN = "http_403"             # 拒绝访问
+ERROR_RISK_CONTROL = "http_412"          # 触发风控（B站 412 / -412）
+ERROR_RATE_LIMITED = "http_429"          # 请求过于频繁
+ERROR_HTTP = "http_error"                # 其他HTTP错误状态
+ERROR_DECODE = "decode"                  # 响应不是合法JSON
+ERROR_SCHEMA = "schema"                  # JSON结构与预期不符
+ERROR_API = "api_error"                  # 接口返回错误码
+ERROR_UNAVAILABLE = "unavailable"        # 所有接口均不可用
+ERROR_UNKNOWN = "unknown"
+
+# 解析失败时每隔多少次采样一次响应内容，以及采样的最大长度和保留条数
+PAYLOAD_SAMPLE_EVERY = 10
+PAYLOAD_SAMPLE_LIMIT = 2048
+PAYLOAD_SAMPLES_PER_KEY = 3
+
+
+class FetchError(Exception):
+    """带错误分类的热搜获取异常"""
+
+    def __init__(self, message: str, category: str = ERROR_UNKNOWN):
+        super().__init__(message, category)
+        self.message = message
+        self.category = category
+
+    def __str__(self) -> str:
+        return self.message
+
+
+class ErrorCounter:
+    """
+    按 (平台, 接口, 错误分类) 计数的错误计数器
+
+    写入只做一次 deque.append，不加锁，可以在请求线程中直接调用；
+    读取时再把积压的事件汇总到计数表。
+    """
+
+    # 积压事件超过该数量时在写入线程中顺带汇总，避免无人读取时无限增长
+    DRAIN_THRESHOLD = 4096
+
+    def __init__(self):
+        self._events: deque = deque()
+        self._totals: Dict[Tuple[str, str, str], int] = {}
+        self._drain_lock = threading.Lock()
+
+    def incr(self, platform: str, endpoint: str, category: str) -> None:
+        """
+        记录一次错误
+
+        Args:
+            platform: 平台名称
+            endpoint: 接口路径
+            category: 错误分类
+        """
+        self._events.append((platform, endpoint, category))
+
+        if len(self._events) > self.DRAIN_THRESHOLD:
+            self.snapshot()
+
+    def snapshot(self) -> Dict[Tuple[str, str, str], int]:
+        """
+        汇总并返回当前计数
+
+        Returns:
+            {(平台, 接口, 错误分类): 次数}
+        """
+        with self._drain_lock:
+            while True:
+                try:
+                    key = self._events.popleft()
+                except IndexError:
+                    break
+                self._totals[key] = self._totals.get(key, 0) + 1
+
+            return dict(self._totals)
+
+    def clear(self) -> None:
+        """清空计数"""
+        with self._drain_lock:
+            self._events.clear()
+            self._totals.clear()
+
+
+error_counter = ErrorCounter()
+
+# 解析失败的响应采样 {(平台, 接口): deque([采样, ...])}
+payload_samples: Dict[Tuple[str, str], deque] = {}
+_sample_counters: Dict[Tuple[str, str], Iterator[int]] = {}
+
+
+def get_endpoint(url: str) -> str:
+    """
+    返回URL的接口路径
+
+    Args:
+        url: 请求URL
+
+    Returns:
+        接口路径
+    """
+    return urlparse(url).path or url
+
+
+def classify_status(status: int) -> str:
+    """
+    根据HTTP状态码返回错误分类
+
+    Args:
+        status: HTTP状态码
+
+    Returns:
+        错误分类
+    """
+    return {
+        403: ERROR_FORBIDDEN,
+        412: ERROR_RISK_CONTROL,
+        429: ERROR_RATE_LIMITED,
+    }.get(status, ERROR_HTTP)
+
+
+def classify_request_error(error: Exception) -> str:
+    """
+    根据 requests 异常返回错误分类
+
+    直接读取 response.raw 时（如流式解析），读取阶段的错误是未经 requests 包装的 urllib3 异常，一并分类
+
+    Args:
+        error: 请求异常
+
+    Returns:
+        错误分类
+    """
+    if isinstance(error, (requests.exceptions.Timeout, urllib3.exceptions.TimeoutError)):
+        return ERROR_TIMEOUT
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        return classify_status(error.response.status_code)
+    if isinstance(error, (requests.exceptions.ConnectionError, urllib3.exceptions.ProtocolError)):
+        return ERROR_CONNECTION
+    if isinstance(error, urllib3.exceptions.DecodeError):
+        return ERROR_DECODE
+    return ERROR_UNKNOWN
+
+
+def record_fetch_error(platform: str, endpoint: str, category: str, reason: str = "") -> None:
+    """
+    记录一次请求错误，给出 reason 时按 PAYLOAD_SAMPLE_EVERY 采样保存
+
+    Args:
+        platform: 平台名称
+        endpoint: 接口路径
+        category: 错误分类
+        reason: 错误信息
+    """
+    error_counter.incr(platform, endpoint, category)
+
+    if reason:
+        capture_sample(platform, endpoint, category, reason, reason)
+
+
+def record_parse_failure(platform: str, endpoint: str, payload: Any, category: str, reason: str = "") -> None:
+    """
+    记录一次解析失败，并按 PAYLOAD_SAMPLE_EVERY 采样保存响应内容
+
+    Args:
+        platform: 平台名称
+        endpoint: 接口路径
+        payload: 原始响应（bytes、str 或已解码的JSON）
+        category: 错误分类
+        reason: 失败原因
+    """
+    error_counter.incr(platform, endpoint, category)
+    capture_sample(platform, endpoint, category, reason, payload)
+
+
+def capture_sample(platform: str, endpoint: str, category: str, reason: str, payload: Any) -> None:
+    """
+    按 PAYLOAD_SAMPLE_EVERY 采样保存失败时的内容，每个接口的第一次失败总会被采样
+
+    Args:
+        platform: 平台名称
+        endpoint: 接口路径
+        category: 错误分类
+        reason: 失败原因
+        payload: 原始响应（bytes、str 或已解码的JSON）
+    """
+    key = (platform, endpoint)
+    counter = _sample_counters.get(key)
+    if counter is None:
+        counter = _sample_counters.setdefault(key, itertools.count())
+
+    if next(counter) % PAYLOAD_SAMPLE_EVERY:
+        return
+
+    if isinstance(payload, bytes):
+        text = payload[:PAYLOAD_SAMPLE_LIMIT].decode('utf-8', errors='replace')
+    elif isinstance(payload, str):
+        text = payload[:PAYLOAD_SAMPLE_LIMIT]
+    else:
+        text = json.dumps(payload, ensure_ascii=False, default=str)[:PAYLOAD_SAMPLE_LIMIT]
+
+    samples = payload_samples.get(key)
+    if samples is None:
+        samples = payload_samples.setdefault(key, deque(maxlen=PAYLOAD_SAMPLES_PER_KEY))
+    samples.append({
+        "ts": time.time(),
+        "category": category,
+        "reason": reason,
+        "payload": text,
+    })
+
+
+def set_fetch_mode(mode: str, archive_path: Optional[str] = None) -> None:
+    """
+    设置请求模式
+
+    Args:
+        mode: live / record / replay
+        archive_path: 归档文件路径（gzip压缩的JSON Lines）
+    """
+    if mode not in FETCH_MODES:
+        raise ValueError(f"未知的请求模式: {mode}")
+
+    fetch_mode["mode"] = mode
+    if archive_path:
+        fetch_mode["archive_path"] = archive_path
+
+    _replay_records.clear()
+    _replay_cursors.clear()
+
+    if mode == "replay":
+        for record in iter_archive(fetch_mode["archive_path"]):
+            key = get_request_key(record["url"], record.get("params"))
+            _replay_records.setdefault(key, []).append(record)
+
+
+def get_request_key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """
+    生成请求键，用于匹配归档记录
+
+    Args:
+        url: 请求URL
+        params: 查询参数
+
+    Returns:
+        请求键字符串
+    """
+    return f"{url}?{json.dumps(params or {}, sort_keys=True, ensure_ascii=False)}"
+
+
+def iter_archive(archive_path: str) -> Iterator[Dict[str, Any]]:
+    """
+    按记录顺序读取归档文件
+
+    Args:
+        archive_path: 归档文件路径
+
+    Returns:
+        归档记录迭代器，每条记录包含 'ts', 'url', 'params', 'status', 'headers', 'body', 'body_encoding'
+    """
+    with gzip.open(archive_path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def record_response(
+        url: str,
+        params: Optional[Dict[str, Any]],
+        status: int,
+        body: bytes,
+        headers: Optional[Dict[str, str]] = None
+) -> None:
+    """
+    将原始响应追加写入归档文件
+
+    响应体按原始字节保存：是合法 UTF-8 时直接存为文本，否则存为 base64，
+    由 body_encoding 标明，回放时经 get_record_body 还原为相同的字节
+
+    Args:
+        url: 请求URL
+        params: 查询参数
+        status: HTTP状态码
+        body: 原始响应体
+        headers: 响应头，仅保留条件请求相关的字段
+    """
+    headers = headers or {}
+    try:
+        text, body_encoding = body.decode('utf-8'), "utf-8"
+    except UnicodeDecodeError:
+        text, body_encoding = base64.b64encode(body).decode('ascii'), "base64"
+
+    record = {
+        "ts": time.time(),
+        "url": url,
+        "params": params or {},
+        "status": status,
+        "headers": {name: headers[name] for name in ('ETag', 'Last-Modified') if name in headers},
+        "body": text,
+        "body_encoding": body_encoding,
+    }
+    line = json.dumps(record, ensure_ascii=False) + "\n"
+
+    with _archive_lock:
+        # gzip 支持多成员追加，每次写入一个独立成员
+        with gzip.open(fetch_mode["archive_path"], "at", encoding="utf-8") as f:
+            f.write(line)
+
+
+def get_record_body(record: Dict[str, Any]) -> bytes:
+    """
+    还原归档记录中的原始响应体
+
+    Args:
+        record: 归档记录
+
+    Returns:
+        原始响应体
+    """
+    if record.get("body_encoding") == "base64":
+        return base64.b64decode(record["body"])
+    return record["body"].encode('utf-8')
+
+
+def replay_response(url: str, params: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    """
+    从归档中按顺序取出下一条匹配的响应，取完后从头循环
+
+    Args:
+        url: 请求URL
+        params: 查询参数
+
+    Returns:
+        归档记录或None
+    """
+    key = get_request_key(url, params)
+    records = _replay_records.get(key)
+
+    if not records:
+        return None
+
+    index = _replay_cursors.get(key, 0)
+    _replay_cursors[key] = (index + 1) % len(records)
+    return records[index]
+
+
+def get_conditional_headers(key: str) -> Dict[str, str]:
+    """
+    根据上次响应生成条件请求头
+
+    只有平台曾返回过 ETag / Last-Modified 时才会发送对应的条件请求头
+
+    Args:
+        key: 请求键
+
+    Returns:
+        条件请求头字典
+    """
+    state = _conditional_state.get(key, {})
+    headers = {}
+
+    if state.get("etag"):
+        headers['If-None-Match'] = state["etag"]
+    if state.get("last_modified"):
+        headers['If-Modified-Since'] = state["last_modified"]
+
+    return headers
+
+
+def is_body_unchanged(key: str, body: bytes) -> bool:
+    """
+    比较响应体哈希，并记录本次哈希
+
+    Args:
+        key: 请求键
+        body: 原始响应体
+
+    Returns:
+        响应体是否与上次相同
+    """
+    body_hash = hashlib.blake2b(body, digest_size=16).digest()
+    state = _conditional_state.setdefault(key, {})
+
+    if state.get("body_hash") == body_hash:
+        return True
+
+    state["body_hash"] = body_hash
+    return False
+
+
+def discard_conditional_state(platform: str) -> None:
+    """
+    丢弃平台最近一次请求的条件请求状态，下次请求将重新解析
+
+    Args:
+        platform: 平台名称
+    """
+    key = last_responses.get(platform, {}).get("key")
+    if key:
+        _conditional_state.pop(key, None)
+
+
+def count_fetch(platform: str, field: str) -> None:
+    """
+    累加请求统计
+
+    Args:
+        platform: 平台名称
+        field: 统计字段
+    """
+    platform_stats = fetch_stats.setdefault(platform, {"requests": 0, "not_modified": 0, "unchanged": 0})
+    platform_stats[field] += 1
+
+
+def get_skip_rate(platform: str) -> float:
+    """
+    返回平台因内容未变化而跳过解析的比例
+
+    Args:
+        platform: 平台名称
+
+    Returns:
+        跳过比例（0-1）
+    """
+    platform_stats = fetch_stats.get(platform)
+    if not platform_stats or not platform_stats["requests"]:
+        return 0.0
+
+    return (platform_stats["not_modified"] + platform_stats["unchanged"]) / platform_stats["requests"]
 
 
 def make_request(
         url: str,
         headers: Dict[str, str],
         params: Optional[Dict[str, Any]] = None,
-        timeout: int = 10
-) -> Optional[Dict[str, Any]]:
+        timeout: int = 10,
+        conditional: bool = False,
+        platform: str = "",
+        decode: bool = True
+) -> Any:
     """
     发送HTTP GET请求并返回JSON数据
 
+    record 模式下会同时记录原始响应，replay 模式下不发出网络请求，直接回放归档。
+    conditional 为 True 时会发送条件请求头，并在 304 或响应体哈希与上次相同时
+    跳过JSON解码，直接返回 NOT_MODIFIED。
+    decode 为 False 时返回未解码的响应体，由调用方交给 decode_and_parse 在执行器中解码。
+
     Args:
         url: 请求URL
         headers: 请求头
         params: 查询参数
         timeout: 超时时间
+        conditional: 是否启用条件请求和响应体哈希比较
+        platform: 平台名称，用于统计
+        decode: 是否解码JSON
 
     Returns:
-        JSON数据字典或None
+        JSON数据字典（decode 为 False 时为响应体 bytes）、NOT_MODIFIED 或None
     """
+    key = get_request_key(url, params)
+    # 错误统计使用的平台与接口
+    source, endpoint = platform or urlparse(url).netloc, get_endpoint(url)
+
     try:
-        response = requests.get(
-            url,
-            headers=headers,
-            params=params,
-            timeout=timeout
-        )
-        response.raise_for_status()
-        return response.json()
+        if platform:
+            count_fetch(platform, "requests")
+
+        if fetch_mode["mode"] == "replay":
+            record = replay_response(url, params)
+            if not record:
+                return None
+            status, body = record["status"], get_record_body(record)
+            response_headers = record.get("headers", {})
+
+            if status != 304 and not 200 <= status < 300:
+                record_fetch_error(source, endpoint, classify_status(status))
+                return None
+        else:
+            if conditional:
+                headers = {**headers, **get_conditional_headers(key)}
+
+            response = requests.get(
+                url,
+                headers=headers,
+                params=params,
+                timeout=timeout
+            )
+
+            if fetch_mode["mode"] == "record":
+                # 归档写入失败不影响本次响应
+                try:
+                    record_response(url, params, response.status_code, response.content, response.headers)
+                except OSError as e:
+                    logger.warning(f"写入归档失败: {e}")
+
+            if response.status_code != 304:
+                response.raise_for_status()
+            status, body = response.status_code, response.content
+            response_headers = response.headers
+
+        if platform:
+            last_responses[platform] = {"size": len(body), "endpoint": endpoint, "key": key}
+
+        if conditional:
+            if status == 304:
+                if platform:
+                    count_fetch(platform, "not_modified")
+                return NOT_MODIFIED
+
+            if not 200 <= status < 300:
+                return None
+
+            state = _conditional_state.setdefault(key, {})
+            state["etag"] = response_headers.get('ETag', '')
+            state["last_modified"] = response_headers.get('Last-Modified', '')
+
+            if is_body_unchanged(key, body):
+                if platform:
+                    count_fetch(platform, "unchanged")
+                return NOT_MODIFIED
+
+        if not 200 <= status < 300:
+            return None
+
+        if not decode:
+            return body
+
+        return json.loads(body)
     except requests.exceptions.RequestException as e:
-        print(f"网络请求错误: {e}")
-    except json.JSONDecodeError:
-        print("JSON解析错误")
+        record_fetch_error(source, endpoint, classify_request_error(e))
+    except ValueError as e:
+        # JSONDecodeError 或非 UTF-8 响应体的 UnicodeDecodeError
+        # 解码失败时丢弃哈希，避免下次相同的响应被当作未变化
+        _conditional_state.pop(key, None)
+        record_parse_failure(source, endpoint, body, ERROR_DECODE, str(e))
+    except Exception as e:
+        # 非预期的异常（多为代码错误）保留类型和信息，避免被计数吞掉
+        logger.debug(f"请求异常: {url}", exc_info=True)
+        record_fetch_error(source, endpoint, ERROR_UNKNOWN, f"{type(e).__name__}: {e}")
+
+    return None
+
+
+def decode_and_parse(parser: Callable[[Any], Any], payload: Any) -> Any:
+    """
+    解码响应体并交给解析器，作为一个整体在执行器中运行
+
+    解码和解析中的错误都以 FetchError 抛出，以便调用方与执行器本身的故障区分开
+
+    Args:
+        parser: 解析函数（进程池需要可被 pickle）
+        payload: 响应体 bytes，或已解码的JSON（如流式解析的结果）
+
+    Returns:
+        解析结果
+    """
+    if isinstance(payload, (bytes, str)):
+        try:
+            payload = json.loads(payload)
+        except ValueError as e:
+            # 非 UTF-8 的响应体会抛出 UnicodeDecodeError 而不是 JSONDecodeError
+            raise FetchError(f"JSON解析错误: {e}", ERROR_DECODE)
+
+    try:
+        return parser(payload)
+    except FetchError:
+        raise
+    except Exception as e:
+        raise FetchError(f"{type(e).__name__}: {e}", ERROR_SCHEMA)
+
+
+def find_by_prefix(data: Any, prefix: str) -> List[Any]:
+    """
+    按 ijson 风格的路径（如 data.word_list.item）取出列表
+
+    Args:
+        data: 已解码的JSON数据
+        prefix: 路径，以 .item 结尾表示列表元素
+
+    Returns:
+        匹配的列表，路径不存在时为空列表
+    """
+    for name in prefix.split("."):
+        if name == "item":
+            break
+        if not isinstance(data, dict):
+            return []
+        data = data.get(name)
+
+    return data if isinstance(data, list) else []
+
+
+def make_stream_request(
+        url: str,
+        headers: Dict[str, str],
+        prefix: str,
+        limit: int,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: int = 10,
+        conditional: bool = False,
+        platform: str = ""
+) -> Any:
+    """
+    发送HTTP GET请求，边解压边增量解析JSON，取到前 limit 个元素后立即停止读取
+
+    未安装 ijson 或处于 record 模式（需要完整响应体）时退化为 make_request。
+    conditional 为 True 时，响应体哈希只覆盖已读取的元素。
+
+    Args:
+        url: 请求URL
+        headers: 请求头
+        prefix: 列表元素路径，如 data.word_list.item
+        limit: 最多读取的元素个数
+        params: 查询参数
+        timeout: 超时时间
+        conditional: 是否启用条件请求和哈希比较
+        platform: 平台名称，用于统计
+
+    Returns:
+        元素列表、NOT_MODIFIED 或None
+    """
+    if ijson is None or fetch_mode["mode"] != "live":
+        data = make_request(url, headers, params, timeout, conditional, platform)
+        if data is None or data is NOT_MODIFIED:
+            return data
+        return find_by_prefix(data, prefix)[:limit]
+
+    key = get_request_key(url, params)
+    # 错误统计使用的平台与接口
+    source, endpoint = platform or urlparse(url).netloc, get_endpoint(url)
+
+    try:
+        if platform:
+            count_fetch(platform, "requests")
+
+        if conditional:
+            headers = {**headers, **get_conditional_headers(key)}
+
+        with requests.get(url, headers=headers, params=params, timeout=timeout, stream=True) as response:
+            if conditional and response.status_code == 304:
+                if platform:
+                    count_fetch(platform, "not_modified")
+                return NOT_MODIFIED
+
+            response.raise_for_status()
+
+            # 由 urllib3 按 Content-Encoding 增量解压，提前退出时剩余数据不再下载
+            response.raw.decode_content = True
+            items = list(itertools.islice(ijson.items(response.raw, prefix, use_float=True), limit))
+
+            # 只保留了前 limit 个元素，后续解析量很小
+            if platform:
+                last_responses[platform] = {"size": 0, "endpoint": endpoint, "key": key}
+
+            if conditional:
+                state = _conditional_state.setdefault(key, {})
+                state["etag"] = response.headers.get('ETag', '')
+                state["last_modified"] = response.headers.get('Last-Modified', '')
+
+                partial_body = json.dumps(items, ensure_ascii=False, sort_keys=True).encode('utf-8')
+                if items and is_body_unchanged(key, partial_body):
+                    if platform:
+                        count_fetch(platform, "unchanged")
+                    return NOT_MODIFIED
+
+            return items
+    except (requests.exceptions.RequestException, urllib3.exceptions.HTTPError) as e:
+        # ijson 直接读取 response.raw，读取中途的超时、断连和解压错误以 urllib3 异常抛出
+        record_fetch_error(source, endpoint, classify_request_error(e))
+    except ijson.JSONError as e:
+        _conditional_state.pop(key, None)
+        # 流式解析时没有完整响应体，只记录错误信息
+        record_parse_failure(source, endpoint, str(e), ERROR_DECODE, str(e))
     except Exception as e:
-        print(f"请求异常: {e}")
+        # 非预期的异常（多为代码错误）保留类型和信息，避免被计数吞掉
+        logger.debug(f"请求异常: {url}", exc_info=True)
+        record_fetch_error(source, endpoint, ERROR_UNKNOWN, f"{type(e).__name__}: {e}")
 
     return None
 
@@ -95,6 +803,7 @@ def get_common_headers() -> Dict[str, str]:
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
         'Accept': 'application/json, text/plain, */*',
         'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
+        'Accept-Encoding': get_accept_encoding(),
         'Connection': 'keep-alive',
     }
 
@@ -14,12 +14,28 @@ class Config(BaseModel):
     enable_bilibili: bool = Field(default=True, description="是否启用B站热搜")
     enable_weibo: bool = Field(default=True, description="是否启用微博热搜")
     enable_douyin: bool = Field(default=True, description="是否启用抖音热搜")
+    enable_aggregate: bool = Field(default=True, description="是否启用综合热搜")
+    aggregate_similarity: float = Field(default=0.6, description="综合热搜合并近似词的相似度阈值（0-1）")
 
     # 显示格式配置
     show_hot_value: bool = Field(default=True, description="是否显示热度值")
     show_label: bool = Field(default=True, description="是否显示标签")
     include_top_weibo: bool = Field(default=True, description="是否包含微博置顶热搜")
 
+    # 图片渲染配置
+    render_mode: str = Field(default="text", description="回复模式：text 文本 / image 图片卡片")
+    image_theme: str = Field(default="light", description="图片卡片主题：light / dark")
+    image_font_path: str = Field(default="", description="图片卡片字体路径，留空则自动查找系统中文字体")
+    image_cache_size: int = Field(default=32, description="图片卡片缓存数量")
+
     # 网络请求配置
     request_timeout: int = Field(default=10, description="请求超时时间（秒）")
-    max_retries: int = Field(default=2, description="最大重试次数")
\ No newline at end of file
+    max_retries: int = Field(default=2, description="最大重试次数")
+    fetch_mode: str = Field(default="live", description="请求模式：live 正常请求 / record 记录原始响应 / replay 回放归档")
+    fetch_archive_path: str = Field(default="hot_search_archive.jsonl.gz", description="record/replay 模式的归档文件路径")
+
+    # 解析与渲染执行器配置
+    executor_type: str = Field(default="thread", description="解析与渲染的执行器：inline 事件循环内 / thread 线程池 / process 进程池")
+    executor_workers: int = Field(default=2, description="执行器工作线程或进程数")
+    executor_max_pending: int = Field(default=8, description="执行器最大排队任务数")
+    offload_threshold: int = Field(default=-1, description="响应体超过该字节数时才放到执行器中解析，小于0时启动时自动测量")
\ No newline at end of file
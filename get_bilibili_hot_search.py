@@ -1,45 +1,74 @@
 """
 获取B站热搜榜
 """
-from ys_bot.plugins.nonebot_plugin_announcement.an_utils import get_common_headers, make_request, print_hot_list
+from .an_utils import get_common_headers, make_request, print_hot_list
 from . import an_utils
 
-def get_bilibili_hot_search() -> list:
+def parse_bilibili_data(data: dict) -> list:
     """
-    获取B站热搜榜前十
+    解析B站热搜数据，返回统一格式的列表
+
+    Args:
+        data: 原始数据
 
     Returns:
         热搜列表
     """
-    try:
-        url = "https://api.bilibili.com/x/web-interface/search/square?limit=10"
+    if not data:
+        return []
+
+    if data.get('code') != 0:
+        # -412 为B站风控拦截
+        category = an_utils.ERROR_RISK_CONTROL if data.get('code') == -412 else an_utils.ERROR_API
+        raise an_utils.FetchError(f"API返回错误: {data.get('code')} - {data.get('message', '未知错误')}", category)
+
+    hot_searches = data.get('data', {}).get('trending', {}).get('list', [])[:10]
 
-        headers = get_common_headers()
-        headers['Referer'] = 'https://www.bilibili.com/'
+    result_list = []
+    for i, item in enumerate(hot_searches, 1):
+        result_list.append({
+            'rank': i,
+            'word': item.get('keyword', '未知'),
+            'hot_value': '',
+            'label': ''
+        })
 
-        data = make_request(url, headers)
+    return result_list
 
-        if not data:
-            return []
 
-        if data.get('code') != 0:
-            raise Exception(f"API返回错误: {data.get('code')} - {data.get('message', '未知错误')}")
+def get_bilibili_data(conditional: bool = False, decode: bool = True):
+    """
+    获取B站热搜原始数据
+
+    Args:
+        conditional: 是否启用条件请求，内容未变化时返回 an_utils.NOT_MODIFIED
+        decode: 是否解码JSON，为 False 时返回响应体 bytes
+
+    Returns:
+        原始数据字典（或响应体 bytes）、an_utils.NOT_MODIFIED 或None
+    """
+    url = "https://api.bilibili.com/x/web-interface/search/square?limit=10"
 
-        hot_searches = data.get('data', {}).get('trending', {}).get('list', [])[:10]
+    headers = get_common_headers()
+    headers['Referer'] = 'https://www.bilibili.com/'
 
-        result_list = []
-        for i, item in enumerate(hot_searches, 1):
-            result_list.append({
-                'rank': i,
-                'word': item.get('keyword', '未知'),
-                'hot_value': '',
-                'label': ''
-            })
+    return make_request(url, headers, conditional=conditional, platform='bilibili', decode=decode)
+
+
+def get_bilibili_hot_search() -> list:
+    """
+    获取B站热搜榜前十
+
+    Returns:
+        热搜列表
+    """
+    try:
+        data = get_bilibili_data()
 
-        return result_list
+        return parse_bilibili_data(data)
 
     except Exception as e:
-        raise Exception(f"获取B站热搜失败: {str(e)}")
+        raise an_utils.FetchError(f"获取B站热搜失败: {str(e)}", getattr(e, 'category', an_utils.ERROR_SCHEMA))
 
 
 if __name__ == "__main__":
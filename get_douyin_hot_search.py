@@ -5,15 +5,18 @@ import json
 import re
 from typing import Optional, Dict, Any, List
 
-from ys_bot.plugins.nonebot_plugin_announcement.an_utils import get_common_headers, make_request, print_hot_list
+from .an_utils import get_common_headers, make_request, print_hot_list
 from . import an_utils
 
+# 抖音热搜最多取的条数
+DOUYIN_HOT_LIMIT = 10
+
 def get_douyin_api_configs() -> List[Dict[str, Any]]:
     """
     返回抖音API配置列表
 
     Returns:
-        API配置列表，每个配置包含url和params
+        API配置列表，每个配置包含url和params，可选 stream_prefix 表示支持流式解析的列表路径
     """
     return [
         {
@@ -23,7 +26,9 @@ def get_douyin_api_configs() -> List[Dict[str, Any]]:
                 'aid': '6383',
                 'channel': 'channel_pc_web',
                 'detail_list': '1',
-            }
+            },
+            # detail_list 响应较大，流式解析只取前几条
+            'stream_prefix': 'data.word_list.item',
         },
         {
             'url': "https://api.douyin.com/web/api/v1/hot/search/list/",
@@ -51,27 +56,47 @@ def get_douyin_headers() -> Dict[str, str]:
     return headers
 
 
-def get_douyin_hot_search() -> Optional[Dict[str, Any]]:
+def get_douyin_hot_search(conditional: bool = False, decode: bool = True) -> Any:
     """
     获取抖音热搜数据
 
+    Args:
+        conditional: 是否启用条件请求，内容未变化时返回 an_utils.NOT_MODIFIED
+        decode: 是否解码JSON，为 False 时完整请求返回响应体 bytes（流式解析的结果仍为字典）
+
     Returns:
-        热搜数据字典或None
+        热搜数据字典（或响应体 bytes）、an_utils.NOT_MODIFIED 或None
     """
     try:
         headers = get_douyin_headers()
         api_configs = get_douyin_api_configs()
 
         for i, config in enumerate(api_configs, 1):
-            data = make_request(config['url'], headers, config['params'])
+            if config.get('stream_prefix'):
+                word_list = an_utils.make_stream_request(
+                    config['url'], headers, config['stream_prefix'], DOUYIN_HOT_LIMIT, config['params'],
+                    conditional=conditional, platform='douyin'
+                )
+
+                if word_list is an_utils.NOT_MODIFIED:
+                    return word_list
+                if word_list:
+                    return {'data': {'word_list': word_list}}
+                # 请求失败时直接尝试下一个接口；只有响应中没有该路径时才完整请求同一接口
+                if word_list is None:
+                    continue
+
+            data = make_request(
+                config['url'], headers, config['params'], conditional=conditional, platform='douyin', decode=decode
+            )
 
             if data:
                 return data
 
-        raise Exception("所有API请求均失败")
+        raise an_utils.FetchError("所有API请求均失败", an_utils.ERROR_UNAVAILABLE)
 
     except Exception as e:
-        raise Exception(f"获取抖音热搜数据失败: {str(e)}")
+        raise an_utils.FetchError(f"获取抖音热搜数据失败: {str(e)}", getattr(e, 'category', an_utils.ERROR_UNKNOWN))
 
 
 def parse_douyin_data(data: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -145,45 +170,58 @@ def get_douyin_hot_search_list() -> List[Dict[str, Any]]:
     try:
         data = get_douyin_hot_search()
 
-        if not data:
-            return []
-
-        hot_list = parse_douyin_data(data)
-
-        if not hot_list:
-            return []
-
-        result_list = []
-        for i, item in enumerate(hot_list[:10], 1):
-            if isinstance(item, dict):
-                word = item.get('word') or item.get('title') or item.get('name') or '未知'
-                hot_value = item.get('hot_value') or item.get('hotValue') or item.get('value') or ''
-                label = item.get('label') or item.get('tag') or ''
-
-                # 格式化热度值
-                if hot_value and isinstance(hot_value, (int, float)):
-                    hot_value_str = f"{hot_value:,}"
-                else:
-                    hot_value_str = str(hot_value) if hot_value else ''
-
-                result_list.append({
-                    'rank': i,
-                    'word': word,
-                    'hot_value': hot_value_str,
-                    'label': label
-                })
-            else:
-                result_list.append({
-                    'rank': i,
-                    'word': str(item)[:50],
-                    'hot_value': '',
-                    'label': ''
-                })
-
-        return result_list
+        return build_douyin_hot_list(data)
 
     except Exception as e:
-        raise Exception(f"解析抖音热搜数据失败: {str(e)}")
+        raise an_utils.FetchError(f"解析抖音热搜数据失败: {str(e)}", getattr(e, 'category', an_utils.ERROR_SCHEMA))
+
+
+def build_douyin_hot_list(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    将抖音原始数据转换为统一格式的热搜列表
+
+    Args:
+        data: 原始数据
+
+    Returns:
+        统一格式的热搜列表
+    """
+    if not data:
+        return []
+
+    hot_list = parse_douyin_data(data)
+
+    if not hot_list:
+        return []
+
+    result_list = []
+    for i, item in enumerate(hot_list[:DOUYIN_HOT_LIMIT], 1):
+        if isinstance(item, dict):
+            word = item.get('word') or item.get('title') or item.get('name') or '未知'
+            hot_value = item.get('hot_value') or item.get('hotValue') or item.get('value') or ''
+            label = item.get('label') or item.get('tag') or ''
+
+            # 格式化热度值
+            if hot_value and isinstance(hot_value, (int, float)):
+                hot_value_str = f"{hot_value:,}"
+            else:
+                hot_value_str = str(hot_value) if hot_value else ''
+
+            result_list.append({
+                'rank': i,
+                'word': word,
+                'hot_value': hot_value_str,
+                'label': label
+            })
+        else:
+            result_list.append({
+                'rank': i,
+                'word': str(item)[:50],
+                'hot_value': '',
+                'label': ''
+            })
+
+    return result_list
 
 
 if __name__ == "__main__":
@@ -1,59 +1,86 @@
 """
 获取微博热搜榜
 """
-from ys_bot.plugins.nonebot_plugin_announcement import an_utils
+from . import an_utils
 
 
-def get_weibo_hot_search() -> list:
+def parse_weibo_data(data: dict) -> list:
     """
-    获取微博热搜榜
+    解析微博热搜数据，返回统一格式的列表
+
+    Args:
+        data: 原始数据
 
     Returns:
         热搜列表
     """
-    try:
-        url = "https://weibo.com/ajax/side/hotSearch"
+    if not data:
+        return []
+
+    # 获取热搜列表
+    hot_searches = data.get('data', {}).get('realtime', [])
+
+    if not hot_searches:
+        return []
 
-        headers = an_utils.get_common_headers()
-        headers['Referer'] = 'https://s.weibo.com/'
+    # 处理置顶热搜
+    hotgov = data.get('data', {}).get('hotgov', {})
+    result_list = []
 
-        data = an_utils.make_request(url, headers)
+    # 如果有置顶热搜，作为第0条
+    if hotgov:
+        result_list.append({
+            'rank': 0,
+            'word': hotgov.get('word', ''),
+            'hot_value': hotgov.get('num', ''),
+            'label': '置顶'
+        })
 
-        if not data:
-            return []
+    # 处理普通热搜
+    for i, item in enumerate(hot_searches[:10], 1):
+        result_list.append({
+            'rank': i,
+            'word': item.get('word', ''),
+            'hot_value': item.get('num', ''),
+            'label': item.get('label_name', '')
+        })
 
-        # 获取热搜列表
-        hot_searches = data.get('data', {}).get('realtime', [])
+    return result_list
 
-        if not hot_searches:
-            return []
 
-        # 处理置顶热搜
-        hotgov = data.get('data', {}).get('hotgov', {})
-        result_list = []
+def get_weibo_data(conditional: bool = False, decode: bool = True):
+    """
+    获取微博热搜原始数据
+
+    Args:
+        conditional: 是否启用条件请求，内容未变化时返回 an_utils.NOT_MODIFIED
+        decode: 是否解码JSON，为 False 时返回响应体 bytes
+
+    Returns:
+        原始数据字典（或响应体 bytes）、an_utils.NOT_MODIFIED 或None
+    """
+    url = "https://weibo.com/ajax/side/hotSearch"
 
-        # 如果有置顶热搜，作为第0条
-        if hotgov:
-            result_list.append({
-                'rank': 0,
-                'word': hotgov.get('word', ''),
-                'hot_value': hotgov.get('num', ''),
-                'label': '置顶'
-            })
+    headers = an_utils.get_common_headers()
+    headers['Referer'] = 'https://s.weibo.com/'
 
-        # 处理普通热搜
-        for i, item in enumerate(hot_searches[:10], 1):
-            result_list.append({
-                'rank': i,
-                'word': item.get('word', ''),
-                'hot_value': item.get('num', ''),
-                'label': item.get('label_name', '')
-            })
+    return an_utils.make_request(url, headers, conditional=conditional, platform='weibo', decode=decode)
+
+
+def get_weibo_hot_search() -> list:
+    """
+    获取微博热搜榜
+
+    Returns:
+        热搜列表
+    """
+    try:
+        data = get_weibo_data()
 
-        return result_list
+        return parse_weibo_data(data)
 
     except Exception as e:
-        raise Exception(f"获取微博热搜失败: {str(e)}")
+        raise an_utils.FetchError(f"获取微博热搜失败: {str(e)}", getattr(e, 'category', an_utils.ERROR_SCHEMA))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,39 @@
+"""综合热搜合并测试"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from an_aggregate import merge_hot_lists  # noqa: E402
+
+
+def test_exact_match_after_normalization():
+    result = merge_hot_lists({
+        'weibo': [{'rank': 1, 'word': '#某地发生地震#', 'hot_value': '1,200,000'}],
+        'bilibili': [{'rank': 1, 'word': '某地 发生地震'}],
+    })
+
+    assert len(result) == 1
+    assert result[0]['word'] == '某地发生地震'
+    assert result[0]['platforms'] == ['weibo', 'bilibili']
+
+
+def test_ngram_similar_terms_are_merged():
+    result = merge_hot_lists({
+        'weibo': [{'rank': 1, 'word': '某地发生地震'}],
+        'douyin': [{'rank': 1, 'word': '某地发生4.5级地震'}],
+    }, threshold=0.6)
+
+    assert len(result) == 1
+    assert set(result[0]['platforms']) == {'weibo', 'douyin'}
+
+
+def test_unrelated_terms_are_kept_apart():
+    result = merge_hot_lists({
+        'weibo': [{'rank': 1, 'word': '某地发生地震'}, {'rank': 2, 'word': '天气预报'}],
+        'douyin': [{'rank': 1, 'word': '新歌发布'}],
+    })
+
+    assert len(result) == 3
+    assert all(len(item['platforms']) == 1 for item in result)
+    assert [item['rank'] for item in result] == [1, 2, 3]
@@ -0,0 +1,93 @@
+"""条件请求与响应体哈希测试"""
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("requests")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import an_utils  # noqa: E402
+
+URL = "https://weibo.com/ajax/side/hotSearch"
+BODY = b'{"data": {"realtime": [{"word": "\xe7\x83\xad\xe6\x90\x9c", "num": 1}]}}'
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, content=BODY, headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        pass
+
+
+@pytest.fixture
+def responses(monkeypatch):
+    """按顺序返回预设响应，并记录每次请求的请求头"""
+    queue, sent_headers = [], []
+
+    def fake_get(url, headers=None, params=None, timeout=None):
+        sent_headers.append(headers)
+        return queue.pop(0)
+
+    monkeypatch.setattr(an_utils.requests, "get", fake_get)
+    monkeypatch.setattr(an_utils, "_conditional_state", {})
+    monkeypatch.setattr(an_utils, "fetch_stats", {})
+    monkeypatch.setattr(an_utils, "last_responses", {})
+    return queue, sent_headers
+
+
+def fetch(conditional=True):
+    return an_utils.make_request(URL, {}, conditional=conditional, platform='weibo', decode=False)
+
+
+def test_not_modified_status_skips_parsing(responses):
+    queue, sent_headers = responses
+    queue.append(FakeResponse(headers={'ETag': '"v1"'}))
+    queue.append(FakeResponse(status_code=304, content=b''))
+
+    assert fetch() == BODY
+    assert fetch() is an_utils.NOT_MODIFIED
+    assert sent_headers[1]['If-None-Match'] == '"v1"'
+    assert an_utils.fetch_stats['weibo']['not_modified'] == 1
+
+
+def test_unchanged_body_skips_parsing(responses):
+    queue, _ = responses
+    queue.extend([FakeResponse(), FakeResponse(), FakeResponse(content=BODY + b' ')])
+
+    # 哈希在解析之前就已记录，第二次相同的响应体直接返回 NOT_MODIFIED
+    assert fetch() == BODY
+    assert fetch() is an_utils.NOT_MODIFIED
+    assert fetch() == BODY + b' '
+    assert an_utils.fetch_stats['weibo'] == {"requests": 3, "not_modified": 0, "unchanged": 1}
+    assert an_utils.get_skip_rate('weibo') == pytest.approx(1 / 3)
+
+
+def test_failed_parse_discards_hash(responses):
+    queue, _ = responses
+    queue.extend([FakeResponse(), FakeResponse()])
+
+    def broken_parser(data):
+        raise KeyError('realtime')
+
+    data = fetch()
+    with pytest.raises(an_utils.FetchError):
+        an_utils.decode_and_parse(broken_parser, data)
+    an_utils.discard_conditional_state('weibo')
+
+    # 同样的响应体必须重新解析，否则会一直停留在旧快照上
+    assert fetch() == BODY
+
+
+def test_unconditional_request_always_returns_body(responses):
+    queue, sent_headers = responses
+    queue.extend([FakeResponse(headers={'ETag': '"v1"'}), FakeResponse()])
+
+    assert fetch(conditional=False) == BODY
+    assert fetch(conditional=False) == BODY
+    assert 'If-None-Match' not in sent_headers[1]
+    assert an_utils.get_skip_rate('weibo') == 0.0
@@ -0,0 +1,31 @@
+"""请求错误分类测试"""
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("requests")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import urllib3  # noqa: E402
+
+import an_utils  # noqa: E402
+
+
+def test_non_utf8_body_is_a_decode_error():
+    body = '{"msg": "访问过于频繁"}'.encode('gbk')
+
+    with pytest.raises(an_utils.FetchError) as exc_info:
+        an_utils.decode_and_parse(lambda data: data, body)
+
+    assert exc_info.value.category == an_utils.ERROR_DECODE
+
+
+@pytest.mark.parametrize("error, category", [
+    (urllib3.exceptions.ReadTimeoutError(None, "/", "Read timed out."), an_utils.ERROR_TIMEOUT),
+    (urllib3.exceptions.ProtocolError("Connection broken"), an_utils.ERROR_CONNECTION),
+    (urllib3.exceptions.DecodeError("Received response with content-encoding: gzip"), an_utils.ERROR_DECODE),
+])
+def test_stream_read_errors_are_classified(error, category):
+    assert an_utils.classify_request_error(error) == category